@@ -4,17 +4,20 @@ Chorus CLI - Command line tool
 """
 
 import argparse
-from datetime import datetime
-from pathlib import Path
-from .core import PromptStorage
-from .web_server import start_web_server
+
 from .utils.colors import Colors
 
+# Heavier imports (storage, web server, datetime/pathlib) are done inside the
+# command handlers so that `chorus --help` and each subcommand only pay for
+# what they actually use.
+
 
 def extract_file(args):
     """Extract prompts from a single file."""
+    from pathlib import Path
+
     print(Colors.cyan(f"Extracting prompts from: {args.file}"))
-    
+
     if not Path(args.file).exists():
         print(Colors.red(f"File not found: {args.file}"))
         return
@@ -38,6 +41,8 @@ def my_function(text: str) -> str:
 
 def list_runs(args):
     """List all runs with their metadata."""
+    from .core import PromptStorage
+
     storage = PromptStorage()
     runs = storage.list_all_runs()
     
@@ -60,6 +65,11 @@ def list_runs(args):
 
 def list_prompts(args):
     """List all tracked prompts."""
+    from itertools import groupby
+    from operator import attrgetter
+
+    from .core import PromptStorage, parse_version_parts
+
     storage = PromptStorage()
     all_prompts = storage.list_prompts()
     
@@ -78,17 +88,15 @@ def list_prompts(args):
             return
         all_prompts = filtered
     
-    # Group by function
-    by_function = {}
-    for prompt in all_prompts:
-        func_name = prompt.function_name
-        if func_name not in by_function:
-            by_function[func_name] = []
-        by_function[func_name].append(prompt)
-    
-    for func_name, prompts in by_function.items():
+    # One global sort (numeric version order, not lexicographic), then
+    # stream the groups instead of building a dict and re-sorting per group
+    all_prompts.sort(
+        key=lambda p: (p.function_name, parse_version_parts(p.project_version), p.agent_version)
+    )
+
+    for func_name, prompts in groupby(all_prompts, key=attrgetter('function_name')):
         print(f"\n{Colors.colorize(func_name + ':', Colors.CYAN + Colors.BOLD)}")
-        for prompt in sorted(prompts, key=lambda x: x.version):
+        for prompt in prompts:
             print(f"  {Colors.colorize('v' + prompt.version, Colors.GREEN)} - {prompt.description}")
             print(f"      {Colors.colorize('Created:', Colors.YELLOW)} {prompt.created_at.strftime('%Y-%m-%d %H:%M:%S')}")
             print(f"      {Colors.colorize('Tags:', Colors.YELLOW)} {', '.join(prompt.tags)}")
@@ -113,6 +121,8 @@ def list_prompts(args):
 
 def show_prompt(args):
     """Show details of a specific prompt."""
+    from .core import PromptStorage
+
     storage = PromptStorage()
     prompt = storage.get_prompt(args.function, args.version)
     
@@ -149,6 +159,10 @@ def show_prompt(args):
 
 def export_prompts(args):
     """Export prompts to a file."""
+    from datetime import datetime
+
+    from .core import PromptStorage
+
     storage = PromptStorage()
     all_prompts = storage.list_prompts()
     
@@ -157,22 +171,52 @@ def export_prompts(args):
         return
     
     output_file = args.output or "prompts_export.json"
-    
-    import json
-    export_data = {
-        "exported_at": str(datetime.now().isoformat()),
-        "total_prompts": len(all_prompts),
-        "prompts": [prompt.to_dict() for prompt in all_prompts]
-    }
-    
+
+    try:
+        import orjson
+
+        def _dump_record(record):
+            return orjson.dumps(record).decode('utf-8')
+    except ImportError:
+        import json
+
+        def _dump_record(record):
+            return json.dumps(record)
+
+    total = len(all_prompts)
+
+    # Stream one record at a time instead of materializing the whole export
+    # in memory before serializing it
     with open(output_file, 'w') as f:
-        json.dump(export_data, f, indent=2)
-    
-    print(Colors.colorize(f"Exported {len(all_prompts)} prompts to {output_file}", Colors.GREEN))
+        f.write('{\n')
+        f.write(f'  "exported_at": {_dump_record(datetime.now().isoformat())},\n')
+        f.write(f'  "total_prompts": {total},\n')
+        f.write('  "prompts": [\n')
+        for i, prompt in enumerate(all_prompts):
+            f.write('    ' + _dump_record(prompt.to_dict()))
+            f.write(',\n' if i < total - 1 else '\n')
+        f.write('  ]\n}\n')
+
+    print(Colors.colorize(f"Exported {total} prompts to {output_file}", Colors.GREEN))
+
+
+def compact_runs(args):
+    """Merge older run files into the compressed archive."""
+    from .core import PromptStorage
+
+    storage = PromptStorage()
+    archived = storage.compact(keep_last=args.keep)
+
+    if archived:
+        print(Colors.colorize(f"Archived {archived} run file(s), kept the {args.keep} most recent", Colors.GREEN))
+    else:
+        print(Colors.colorize("Nothing to compact.", Colors.YELLOW))
 
 
 def web_interface(args):
     """Start the web interface for prompt management."""
+    from .web_server import start_web_server
+
     print(Colors.colorize(f"Starting web interface on port {args.port}...", Colors.CYAN))
     start_web_server(port=args.port, open_browser=not args.no_browser)
 
@@ -187,6 +231,7 @@ Examples:
   chorus list --verbose         # List all prompts
   chorus show my_function 1.0.0 # Show specific prompt
   chorus export --output my_prompts.json
+  chorus compact --keep 10      # Archive older run files
   chorus web --port 3000
         """
     )
@@ -210,6 +255,10 @@ Examples:
     export_parser = subparsers.add_parser('export', help='Export prompts to file')
     export_parser.add_argument('--output', '-o', help='Output file name')
     
+    # Compact command
+    compact_parser = subparsers.add_parser('compact', help='Archive old run files')
+    compact_parser.add_argument('--keep', type=int, default=10, help='Number of recent run files to keep as-is')
+
     # Web command
     web_parser = subparsers.add_parser('web', help='Start web interface')
     web_parser.add_argument('--port', type=int, default=3000, help='Port to run server on')
@@ -229,6 +278,8 @@ Examples:
         show_prompt(args)
     elif args.command == 'export':
         export_prompts(args)
+    elif args.command == 'compact':
+        compact_runs(args)
     elif args.command == 'web':
         web_interface(args)
 
@@ -6,10 +6,32 @@ import hashlib
 from datetime import datetime
 from typing import Any, Dict, List, Optional
 
+# Prefer blake3 (SIMD-accelerated) when available; blake2b from the stdlib
+# is still considerably faster than md5 and keeps the package dependency-free.
+try:
+    from blake3 import blake3 as _blake3
+except ImportError:
+    _blake3 = None
+
+
+def _hash_prompt(prompt: str) -> str:
+    """Compute the short (8 hex chars) non-cryptographic prompt hash."""
+    if _blake3 is not None:
+        return _blake3(prompt.encode()).hexdigest(length=4)
+    return hashlib.blake2b(prompt.encode(), digest_size=4).hexdigest()
+
 
 class PromptVersion:
     """Versioned prompt with semantic versioning and execution tracking."""
-    
+
+    # Slots keep instances compact (no per-instance __dict__) and make
+    # attribute access cheaper in hot loops over stored prompts
+    __slots__ = (
+        'prompt', 'project_version', 'agent_version', 'function_name',
+        'description', 'tags', 'created_at', 'prompt_hash',
+        'inputs', 'output', 'execution_time', 'execution_id', '_iso'
+    )
+
     def __init__(
         self,
         prompt: str,
@@ -31,60 +53,75 @@ class PromptVersion:
         self.description = description or ""
         self.tags = tags or []
         self.created_at = created_at or datetime.now()
-        self.prompt_hash = hashlib.md5(prompt.encode()).hexdigest()[:8]
+        self._iso = self.created_at.isoformat()
+        self.prompt_hash = _hash_prompt(prompt)
         
         # Execution tracking
         self.inputs = inputs or {}
         self.output = output
         self.execution_time = execution_time
         self.execution_id = execution_id or f"{self.created_at.strftime('%Y%m%d_%H%M%S')}_{self.prompt_hash}"
-    
+
     @property
     def version(self) -> str:
         """Get the combined version string for backward compatibility."""
         return f"{self.project_version}.{self.agent_version}"
     
     def to_dict(self) -> Dict[str, Any]:
-        """Convert to dictionary for storage."""
-        return {
+        """
+        Convert to dictionary for storage.
+
+        Empty/None optional fields are omitted to keep serialized records
+        small; from_dict restores their defaults on load.
+        """
+        data = {
             'prompt': self.prompt,
             'project_version': self.project_version,
             'agent_version': self.agent_version,
             'function_name': self.function_name,
-            'description': self.description,
-            'tags': self.tags,
-            'created_at': self.created_at.isoformat(),
+            'created_at': self._iso,
             'prompt_hash': self.prompt_hash,
-            'inputs': self.inputs,
-            'output': self.output,
-            'execution_time': self.execution_time,
-            'execution_id': self.execution_id
         }
+        if self.description:
+            data['description'] = self.description
+        if self.tags:
+            data['tags'] = self.tags
+        if self.inputs:
+            data['inputs'] = self.inputs
+        if self.output is not None:
+            data['output'] = self.output
+        if self.execution_time is not None:
+            data['execution_time'] = self.execution_time
+        if self.execution_id:
+            data['execution_id'] = self.execution_id
+        return data
     
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'PromptVersion':
         """Create from dictionary."""
-        # Handle backward compatibility for old version field
-        if 'version' in data and 'project_version' not in data and 'system_version' not in data:
-            project_version = data['version']
-            agent_version = 1  # Default agent version for backward compatibility
+        # Fast path for current-format records; fall through to the
+        # backward-compatibility branches only when needed
+        project_version = data.get('project_version')
+        if project_version is not None and 'system_version' not in data:
+            agent_version = data['agent_version']
         elif 'system_version' in data:
             # Handle old system_version field
             project_version = data['system_version']
             agent_version = data['agent_version']
         else:
-            project_version = data['project_version']
-            agent_version = data['agent_version']
-        
+            # Handle old combined version field
+            project_version = data['version']
+            agent_version = 1  # Default agent version for backward compatibility
+
         return cls(
             prompt=data['prompt'],
             project_version=project_version,
             agent_version=agent_version,
             function_name=data['function_name'],
             description=data.get('description'),
-            tags=data.get('tags', []),
+            tags=data.get('tags'),
             created_at=datetime.fromisoformat(data['created_at']),
-            inputs=data.get('inputs', {}),
+            inputs=data.get('inputs'),
             output=data.get('output'),
             execution_time=data.get('execution_time'),
             execution_id=data.get('execution_id')
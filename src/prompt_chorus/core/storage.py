@@ -2,13 +2,72 @@
 Storage and retrieval of prompt versions.
 """
 
+import gzip
 import json
+import os
+import pickle
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
 from typing import List, Optional
 
 from .models import PromptVersion
 
+# Use orjson for JSON parsing/serialization when available - it is several
+# times faster than the stdlib on prompt-heavy payloads. Fall back to the
+# stdlib so the package keeps working without any external dependencies.
+try:
+    import orjson
+
+    def _loads(data: bytes) -> dict:
+        return orjson.loads(data)
+
+    def _dumps(data: dict) -> bytes:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2)
+
+    def _dumps_compact(data: dict) -> bytes:
+        return orjson.dumps(data)
+
+except ImportError:
+    def _loads(data: bytes) -> dict:
+        return json.loads(data)
+
+    def _dumps(data: dict) -> bytes:
+        return json.dumps(data, indent=2).encode('utf-8')
+
+    def _dumps_compact(data: dict) -> bytes:
+        return json.dumps(data, separators=(',', ':')).encode('utf-8')
+
+# Older run files get merged into one compressed JSON Lines archive
+_ARCHIVE_NAME = "runs_archive.jsonl.gz"
+
+# Parse run files concurrently only when enough of them changed to amortize
+# the thread pool setup
+_PARALLEL_PARSE_THRESHOLD = 8
+
+
+def _write_atomic(path: Path, data: bytes) -> None:
+    """
+    Write bytes to path via a temp file in the same directory plus
+    os.replace, so readers never observe a half-written file.
+    """
+    tmp = tempfile.NamedTemporaryFile(
+        'wb', dir=str(path.parent), prefix=f".{path.name}.", delete=False
+    )
+    try:
+        tmp.write(data)
+        tmp.close()
+        os.replace(tmp.name, path)
+    except BaseException:
+        tmp.close()
+        try:
+            os.unlink(tmp.name)
+        except OSError:
+            pass
+        raise
+
 
 class PromptStorage:
     """Handles storage and retrieval of prompt versions."""
@@ -17,17 +76,32 @@ class PromptStorage:
         self.storage_path = Path(storage_path)
         self.storage_path.mkdir(exist_ok=True)
         self.source_filename = source_filename
+        self._run_index_file = self.storage_path / ".runs_index.pkl"
+        self._project_versions = None
+        # Guards mutations when the storage is shared across threads
+        # (e.g. by the threading web server)
+        self._lock = threading.Lock()
         self._load_prompts()
     
     def _load_prompts(self) -> None:
         """Load prompts from storage - from system version files."""
         self.prompts = {}
-        
+        # Secondary indexes so per-function lookups stay O(1) instead of
+        # scanning every stored prompt
+        self._by_function = {}
+        self._latest_by_function = {}
+        # Bumped on every write; consumers can use it to invalidate caches
+        self.generation = 0
+
         # For each run, start fresh - don't load existing prompts
         # This ensures each run creates its own file with only its prompts
     
     def _save_prompts(self) -> None:
         """Save prompts to storage in system_name_version_timestamp.json format."""
+        # Nothing recorded this run - don't serialize an empty run file
+        if not self.prompts:
+            return
+
         # Get current project version for this system
         current_project_version = self.get_project_version() or "1.0.0"
         
@@ -48,18 +122,34 @@ class PromptStorage:
         }
         
         # Save to system version file
-        with open(system_file, 'w') as f:
-            json.dump(run_data, f, indent=2)
+        _write_atomic(system_file, _dumps(run_data))
     
     def add_prompt(self, prompt_version: PromptVersion) -> None:
         """Add a new prompt version."""
         key = f"{prompt_version.function_name}_{prompt_version.project_version}_{prompt_version.agent_version}"
-        self.prompts[key] = prompt_version
+        with self._lock:
+            existing = self.prompts.get(key)
+            self.prompts[key] = prompt_version
+
+            # Keep the per-function indexes in sync (O(1) per add)
+            function_name = prompt_version.function_name
+            bucket = self._by_function.setdefault(function_name, [])
+            if existing is not None:
+                bucket[bucket.index(existing)] = prompt_version
+            else:
+                bucket.append(prompt_version)
+
+            latest = self._latest_by_function.get(function_name)
+            if latest is None or prompt_version.agent_version >= latest.agent_version:
+                self._latest_by_function[function_name] = prompt_version
+
+            self.generation += 1
         # Don't save immediately - let the system save when done
-    
+
     def save_all_prompts(self) -> None:
         """Save all prompts to storage."""
-        self._save_prompts()
+        with self._lock:
+            self._save_prompts()
     
     def get_prompt(self, function_name: str, project_version: str, agent_version: int) -> Optional[PromptVersion]:
         """Get a specific prompt version."""
@@ -69,8 +159,17 @@ class PromptStorage:
     def list_prompts(self, function_name: Optional[str] = None) -> List[PromptVersion]:
         """List all prompts, optionally filtered by function name."""
         if function_name:
-            return [pv for pv in self.prompts.values() if pv.function_name == function_name]
+            return list(self._by_function.get(function_name, []))
         return list(self.prompts.values())
+
+    def get_latest_version(self, function_name: str) -> Optional[PromptVersion]:
+        """Get the latest prompt version for a function, or None."""
+        return self._latest_by_function.get(function_name)
+
+    def get_latest_agent_version(self, function_name: str) -> int:
+        """Get the latest agent version for a function, or 0 if none exist."""
+        latest = self._latest_by_function.get(function_name)
+        return latest.agent_version if latest is not None else 0
     
     def list_system_files(self) -> List[Path]:
         """List all system version files, sorted by creation time."""
@@ -92,15 +191,23 @@ class PromptStorage:
         """
         from .versioning import set_project_version
         validated_version = set_project_version(project_version)
-        
-        # Load existing project versions
-        project_versions = self._load_project_versions()
-        
-        # Update the version for this project
-        project_versions[self.source_filename] = validated_version
-        
-        # Save back to file
-        self._save_project_versions(project_versions)
+
+        # Fast path: the cached mapping already holds this exact version -
+        # the common case for pinned decorators calling this per invocation -
+        # so skip the disk read entirely
+        cached = self._project_versions
+        if cached is not None and cached.get(self.source_filename) == validated_version:
+            return
+
+        # Re-read from disk (not the cache) so entries written by other
+        # storage instances since our last read are preserved
+        project_versions = self._read_project_versions()
+
+        # Skip the write entirely when the stored version is already current
+        if project_versions.get(self.source_filename) != validated_version:
+            project_versions[self.source_filename] = validated_version
+            self._save_project_versions(project_versions)
+        self._project_versions = project_versions
     
     def get_project_version(self) -> Optional[str]:
         """
@@ -110,47 +217,183 @@ class PromptStorage:
         return project_versions.get(self.source_filename)
     
     def _load_project_versions(self) -> dict:
-        """Load project versions from JSON file."""
+        """Load project versions, cached in memory after the first read."""
+        if self._project_versions is None:
+            self._project_versions = self._read_project_versions()
+        return self._project_versions
+
+    def _read_project_versions(self) -> dict:
+        """Read project versions from the JSON file."""
         project_version_file = self.storage_path / "project_version.json"
         if project_version_file.exists():
             try:
-                with open(project_version_file, 'r') as f:
-                    return json.load(f)
-            except (json.JSONDecodeError, FileNotFoundError):
+                with open(project_version_file, 'rb') as f:
+                    return _loads(f.read())
+            except (ValueError, FileNotFoundError):
                 return {}
         return {}
     
     def _save_project_versions(self, project_versions: dict) -> None:
         """Save project versions to JSON file."""
         project_version_file = self.storage_path / "project_version.json"
-        with open(project_version_file, 'w') as f:
-            json.dump(project_versions, f, indent=2)
+        _write_atomic(project_version_file, _dumps(project_versions))
     
     def list_all_runs(self) -> List[dict]:
         """
         List all runs with their metadata.
-        
+
+        Parsed run files are cached in a pickle index keyed by file mtime,
+        so repeated calls (including later CLI invocations) only re-parse
+        files that actually changed.
+
         Returns:
             List of dictionaries with run metadata
         """
+        index = self._load_run_index()
+        dirty = False
+
+        file_stats = [(f, f.stat().st_mtime) for f in self.list_system_files()]
+        to_parse = []
+        for system_file, mtime in file_stats:
+            cached = index.get(str(system_file))
+            if cached is None or cached[0] != mtime:
+                to_parse.append((system_file, mtime))
+
+        if to_parse:
+            # Reading the files is I/O-bound, so overlap the reads with a
+            # thread pool once there are enough of them to be worth it
+            if len(to_parse) > _PARALLEL_PARSE_THRESHOLD:
+                with ThreadPoolExecutor(max_workers=min(8, len(to_parse))) as pool:
+                    parsed = list(pool.map(self._parse_run_file, [f for f, _ in to_parse]))
+            else:
+                parsed = [self._parse_run_file(f) for f, _ in to_parse]
+            for (system_file, mtime), run in zip(to_parse, parsed):
+                if run is not None:
+                    index[str(system_file)] = (mtime, run)
+                    dirty = True
+
         runs = []
-        for system_file in self.list_system_files():
-            try:
-                with open(system_file, 'r') as f:
-                    data = json.load(f)
-                    # Extract timestamp from filename
-                    filename_parts = system_file.stem.split("_")
+        seen = set()
+        for system_file, mtime in file_stats:
+            path = str(system_file)
+            seen.add(path)
+            cached = index.get(path)
+            if cached is not None and cached[0] == mtime:
+                runs.append(cached[1])
+
+        # Drop index entries for files that no longer exist
+        stale = [path for path in index if path not in seen]
+        for path in stale:
+            del index[path]
+            dirty = True
+
+        if dirty:
+            self._save_run_index(index)
+
+        runs.extend(self._load_archived_runs())
+        return runs
+
+    def compact(self, keep_last: int = 10) -> int:
+        """
+        Merge older run files into the compressed JSON Lines archive.
+
+        Keeps the keep_last newest run files as-is, appends everything older
+        to runs_archive.jsonl.gz (one run document per line) and deletes the
+        originals, so storage startup no longer scans an ever-growing
+        directory of small files.
+
+        Returns:
+            Number of files archived
+        """
+        old_files = self.list_system_files()[keep_last:] if keep_last > 0 else self.list_system_files()
+        if not old_files:
+            return 0
+
+        archive_file = self.storage_path / _ARCHIVE_NAME
+        archived = 0
+        with gzip.open(archive_file, 'ab') as archive:
+            # Append oldest first so the archive stays in chronological order
+            for system_file in reversed(old_files):
+                try:
+                    with open(system_file, 'rb') as f:
+                        data = _loads(f.read())
+                except (OSError, ValueError):
+                    continue
+                data["file_stem"] = system_file.stem
+                archive.write(_dumps_compact(data) + b'\n')
+                system_file.unlink()
+                archived += 1
+        return archived
+
+    def _load_archived_runs(self) -> List[dict]:
+        """Load runs from the compressed archive, newest first."""
+        archive_file = self.storage_path / _ARCHIVE_NAME
+        if not archive_file.exists():
+            return []
+
+        runs = []
+        try:
+            with gzip.open(archive_file, 'rb') as archive:
+                for line in archive:
+                    try:
+                        data = _loads(line)
+                    except ValueError:
+                        continue
+                    filename_parts = data.get("file_stem", "").split("_")
                     timestamp = filename_parts[-1] if len(filename_parts) >= 3 else "unknown"
-                    
                     runs.append({
                         "system_name": data.get("system_name"),
                         "project_version": data.get("project_version"),
                         "timestamp": timestamp,
                         "created_at": data.get("created_at"),
                         "total_prompts": data.get("total_prompts"),
-                        "file_path": str(system_file),
+                        "file_path": str(archive_file),
                         "prompts": data.get("prompts", {})
                     })
-            except (json.JSONDecodeError, KeyError):
-                continue
+        except OSError:
+            pass
+        runs.reverse()
         return runs
+
+    def _parse_run_file(self, system_file: Path) -> Optional[dict]:
+        """Parse a single run file into its metadata dictionary."""
+        try:
+            with open(system_file, 'rb') as f:
+                data = _loads(f.read())
+        except (OSError, ValueError):
+            return None
+
+        # Extract timestamp from filename
+        filename_parts = system_file.stem.split("_")
+        timestamp = filename_parts[-1] if len(filename_parts) >= 3 else "unknown"
+
+        return {
+            "system_name": data.get("system_name"),
+            "project_version": data.get("project_version"),
+            "timestamp": timestamp,
+            "created_at": data.get("created_at"),
+            "total_prompts": data.get("total_prompts"),
+            "file_path": str(system_file),
+            "prompts": data.get("prompts", {})
+        }
+
+    def _load_run_index(self) -> dict:
+        """Load the cached run index mapping file path -> (mtime, run dict)."""
+        try:
+            with open(self._run_index_file, 'rb') as f:
+                index = pickle.load(f)
+            if isinstance(index, dict):
+                return index
+        except (OSError, pickle.PickleError, EOFError, AttributeError):
+            pass
+        return {}
+
+    def _save_run_index(self, index: dict) -> None:
+        """Save the run index atomically; the cache is best-effort."""
+        try:
+            _write_atomic(
+                self._run_index_file,
+                pickle.dumps(index, protocol=pickle.HIGHEST_PROTOCOL)
+            )
+        except OSError:
+            pass
@@ -4,8 +4,49 @@ Dual versioning utilities for prompt changes.
 - Agent version: Incremental version for prompt changes (auto-incremented)
 """
 
+import functools
 import re
-from typing import Tuple, Optional
+from typing import Set, Tuple, Optional
+
+# Keywords that indicate breaking changes
+_BREAKING_KEYWORDS = [
+    'instead of', 'no longer', 'removed', 'deprecated', 'breaking',
+    'change from', 'replaced with', 'completely different', 'new approach',
+    'different format', 'different structure', 'different output',
+    'must not', 'cannot', 'will not', 'discontinued', 'obsolete',
+    'migrate to', 'upgrade to', 'switch to', 'abandoned'
+]
+
+# Keywords that indicate new features or enhancements
+_FEATURE_KEYWORDS = [
+    'also', 'additionally', 'new', 'enhanced', 'improved', 'better',
+    'more', 'extra', 'additional', 'further', 'extended', 'expanded',
+    'support for', 'now supports', 'can also', 'in addition',
+    'optionally', 'option', 'feature', 'capability', 'functionality',
+    'include', 'incorporate', 'integrate', 'combine', 'merge'
+]
+
+# Phrases that suggest new capabilities
+_FUNCTIONALITY_INDICATORS = [
+    'you can now', 'it is now possible', 'added support',
+    'new feature', 'enhanced with', 'upgraded to include',
+    'now includes', 'now provides', 'now offers'
+]
+
+# Full semantic version pattern with pre-release and build metadata support,
+# compiled once at import time
+_SEMVER_RE = re.compile(
+    r'^(0|[1-9]\d*)\.(0|[1-9]\d*)\.(0|[1-9]\d*)'
+    r'(?:-((?:0|[1-9]\d*|\d*[a-zA-Z-][0-9a-zA-Z-]*)(?:\.(?:0|[1-9]\d*|\d*[a-zA-Z-][0-9a-zA-Z-]*))*))?'
+    r'(?:\+([0-9a-zA-Z-]+(?:\.[0-9a-zA-Z-]+)*))?$'
+)
+_semver_match = _SEMVER_RE.match
+
+# Precompiled alternations so each prompt is scanned in a single C-level
+# pass instead of one substring search per keyword.
+_BREAKING_RE = re.compile('|'.join(re.escape(k) for k in _BREAKING_KEYWORDS))
+_FEATURE_RE = re.compile('|'.join(re.escape(k) for k in _FEATURE_KEYWORDS))
+_FUNCTIONALITY_RE = re.compile('|'.join(re.escape(k) for k in _FUNCTIONALITY_INDICATORS))
 
 
 def get_next_agent_version(current_agent_version: int) -> int:
@@ -56,6 +97,7 @@ def get_latest_agent_version_for_function(prompts: dict, function_name: str) ->
     return max(pv.agent_version for pv in function_prompts)
 
 
+@functools.lru_cache(maxsize=1024)
 def analyze_prompt_changes(old_prompt: str, new_prompt: str) -> str:
     """
     Analyze changes between old and new prompts to determine version bump type
@@ -74,70 +116,74 @@ def analyze_prompt_changes(old_prompt: str, new_prompt: str) -> str:
     # Normalize prompts for comparison
     old_normalized = _normalize_prompt(old_prompt)
     new_normalized = _normalize_prompt(new_prompt)
-    
+
+    # Split each prompt once and share the results with both checks
+    old_words = set(old_normalized.split())
+    new_words = set(new_normalized.split())
+    old_sentences = old_normalized.split('.')
+    new_sentences = new_normalized.split('.')
+
     # Check for major changes (breaking changes) - highest priority
-    if _is_major_change(old_normalized, new_normalized):
+    if _is_major_change(old_normalized, new_normalized, old_words, new_words,
+                        old_sentences, new_sentences):
         return 'major'
-    
+
     # Check for minor changes (new features/functionality) - second priority
-    if _is_minor_change(old_normalized, new_normalized):
+    if _is_minor_change(old_normalized, new_normalized, old_words, new_words,
+                        old_sentences, new_sentences):
         return 'minor'
     
     # Default to patch for small changes, bug fixes, and improvements
     return 'patch'
 
 
+@functools.lru_cache(maxsize=2048)
 def _normalize_prompt(prompt: str) -> str:
     """Normalize prompt for comparison by removing extra whitespace and standardizing format."""
-    # Remove extra whitespace and normalize line endings
-    normalized = re.sub(r'\s+', ' ', prompt.strip())
-    # Convert to lowercase for comparison
-    return normalized.lower()
+    # split()/join collapse all whitespace (including line endings) in C,
+    # faster than the equivalent re.sub; lowercase for comparison
+    return ' '.join(prompt.split()).lower()
 
 
-def _is_major_change(old_prompt: str, new_prompt: str) -> bool:
+def _is_major_change(
+    old_prompt: str,
+    new_prompt: str,
+    old_words: Set[str],
+    new_words: Set[str],
+    old_sentences: list,
+    new_sentences: list
+) -> bool:
     """
     Check if changes constitute a major version bump (breaking changes).
-    
+
     MAJOR changes are incompatible changes that break existing functionality:
     - Changing the expected input/output format
     - Removing or significantly altering core functionality
     - Changing the fundamental approach or methodology
     """
-    # Keywords that indicate breaking changes
-    breaking_keywords = [
-        'instead of', 'no longer', 'removed', 'deprecated', 'breaking',
-        'change from', 'replaced with', 'completely different', 'new approach',
-        'different format', 'different structure', 'different output',
-        'must not', 'cannot', 'will not', 'discontinued', 'obsolete',
-        'migrate to', 'upgrade to', 'switch to', 'abandoned'
-    ]
-    
-    # Check if new prompt contains breaking change indicators
-    for keyword in breaking_keywords:
-        if keyword in new_prompt and keyword not in old_prompt:
+    # Check for breaking change indicators introduced by the new prompt:
+    # one precompiled scan of the full text, then keep only keywords the
+    # old prompt did not already contain
+    for keyword in set(_BREAKING_RE.findall(new_prompt)):
+        if keyword not in old_prompt:
             return True
-    
+
     # Check for fundamental structural changes
-    old_sentences = old_prompt.split('.')
-    new_sentences = new_prompt.split('.')
-    
     # If more than 60% of sentences changed, it's likely major
     if len(new_sentences) > 0 and len(old_sentences) > 0:
         changed_ratio = abs(len(new_sentences) - len(old_sentences)) / max(len(old_sentences), 1)
         if changed_ratio > 0.6:
             return True
-    
+
     # Check for complete rewrite (very different content)
     if len(new_prompt) > 0 and len(old_prompt) > 0:
-        # Calculate word-based similarity
-        old_words = set(old_prompt.split())
-        new_words = set(new_prompt.split())
-        common_words = old_words & new_words
-        total_words = old_words | new_words
-        
-        if len(total_words) > 0:
-            similarity = len(common_words) / len(total_words)
+        # Calculate word-based Jaccard similarity; derive the union size by
+        # inclusion-exclusion instead of materializing a third set
+        common = len(old_words & new_words)
+        total = len(old_words) + len(new_words) - common
+
+        if total > 0:
+            similarity = common / total
             # If less than 25% similarity, consider it a major rewrite
             if similarity < 0.25:
                 return True
@@ -151,61 +197,54 @@ def _is_major_change(old_prompt: str, new_prompt: str) -> bool:
     return False
 
 
-def _is_minor_change(old_prompt: str, new_prompt: str) -> bool:
+def _is_minor_change(
+    old_prompt: str,
+    new_prompt: str,
+    old_words: Set[str],
+    new_words: Set[str],
+    old_sentences: list,
+    new_sentences: list
+) -> bool:
     """
     Check if changes constitute a minor version bump (new features).
-    
+
     MINOR changes add new functionality in a backward compatible manner:
     - Adding new capabilities without breaking existing ones
     - Enhancing existing functionality
     - Adding new options or parameters
     - Extending the prompt's scope or capabilities
     """
-    # Keywords that indicate new features or enhancements
-    feature_keywords = [
-        'also', 'additionally', 'new', 'enhanced', 'improved', 'better',
-        'more', 'extra', 'additional', 'further', 'extended', 'expanded',
-        'support for', 'now supports', 'can also', 'in addition',
-        'optionally', 'option', 'feature', 'capability', 'functionality',
-        'include', 'incorporate', 'integrate', 'combine', 'merge'
-    ]
-    
-    # Check if new prompt contains feature indicators
-    for keyword in feature_keywords:
-        if keyword in new_prompt and keyword not in old_prompt:
+    # Check for feature indicators introduced by the new prompt
+    for keyword in set(_FEATURE_RE.findall(new_prompt)):
+        if keyword not in old_prompt:
             return True
-    
+
     # Check for significant additions (new sentences/phrases)
-    old_words = set(old_prompt.split())
-    new_words = set(new_prompt.split())
-    new_words_only = new_words - old_words
-    
-    # If significant new vocabulary was added, it might be minor
-    if len(new_words_only) > 8:  # More than 8 new words indicates substantial addition
-        return True
-    
+    # If significant new vocabulary was added, it might be minor; count with
+    # an early exit instead of building the difference set
+    fresh_words = 0
+    for word in new_words:
+        if word not in old_words:
+            fresh_words += 1
+            if fresh_words > 8:  # More than 8 new words indicates substantial addition
+                return True
+
     # Check for length increase (new content added)
     if len(old_prompt) > 0 and len(new_prompt) > len(old_prompt) * 1.3:  # 30% increase in length
         return True
-    
+
     # Check for new sentence additions (count sentences)
-    old_sentences = [s.strip() for s in old_prompt.split('.') if s.strip()]
-    new_sentences = [s.strip() for s in new_prompt.split('.') if s.strip()]
-    
-    if len(new_sentences) > len(old_sentences) + 1:  # More than one new sentence
+    old_sentence_count = sum(1 for s in old_sentences if s.strip())
+    new_sentence_count = sum(1 for s in new_sentences if s.strip())
+
+    if new_sentence_count > old_sentence_count + 1:  # More than one new sentence
         return True
-    
+
     # Check for new functionality indicators (phrases that suggest new capabilities)
-    functionality_indicators = [
-        'you can now', 'it is now possible', 'added support',
-        'new feature', 'enhanced with', 'upgraded to include',
-        'now includes', 'now provides', 'now offers'
-    ]
-    
-    for indicator in functionality_indicators:
-        if indicator in new_prompt and indicator not in old_prompt:
+    for indicator in set(_FUNCTIONALITY_RE.findall(new_prompt)):
+        if indicator not in old_prompt:
             return True
-    
+
     return False
 
 
@@ -282,6 +321,18 @@ def parse_version_parts(version: str) -> Tuple[int, int, int]:
     - 1.0.0+20130313144700 -> (1, 0, 0)
     - 1.0.0-alpha+001 -> (1, 0, 0)
     """
+    # Fast path: the overwhelmingly common case is a plain "X.Y.Z" string
+    try:
+        major, minor, patch = version.split('.', 2)
+        return int(major), int(minor), int(patch)
+    except (ValueError, TypeError, AttributeError):
+        pass
+
+    match = _semver_match(version.strip())
+    if match:
+        return int(match[1]), int(match[2]), int(match[3])
+
+    # Fall back to lenient parsing for non-semver input
     # Remove pre-release and build metadata for parsing
     clean_version = version.split('-')[0].split('+')[0]
     parts = clean_version.split('.')
@@ -293,18 +344,24 @@ def parse_version_parts(version: str) -> Tuple[int, int, int]:
     return major, minor, patch
 
 
+@functools.lru_cache(maxsize=256)
+def _is_valid_semver(version: str) -> bool:
+    """Memoized regex match for already-type-checked version strings."""
+    return _semver_match(version.strip()) is not None
+
+
 def is_valid_version(version: str) -> bool:
     """
     Check if version string is a valid semantic version.
-    
+
     Supports:
     - Basic semantic version: 1.0.0
     - Pre-release versions: 1.0.0-alpha, 1.0.0-alpha.1, 1.0.0-beta.2
     - Build metadata: 1.0.0+20130313144700, 1.0.0-alpha+001
     """
+    # Type-check before touching the cache: lru_cache hashes its argument,
+    # so unhashable input must be rejected here, not raise from the cache
     if not version or not isinstance(version, str):
         return False
-    
-    # Full semantic version pattern with pre-release and build metadata support
-    pattern = r'^(0|[1-9]\d*)\.(0|[1-9]\d*)\.(0|[1-9]\d*)(?:-((?:0|[1-9]\d*|\d*[a-zA-Z-][0-9a-zA-Z-]*)(?:\.(?:0|[1-9]\d*|\d*[a-zA-Z-][0-9a-zA-Z-]*))*))?(?:\+([0-9a-zA-Z-]+(?:\.[0-9a-zA-Z-]+)*))?$'
-    return bool(re.match(pattern, version.strip()))
+
+    return _is_valid_semver(version)
@@ -4,20 +4,35 @@ Main decorator for tracking and versioning LLM prompts.
 
 import functools
 import inspect
+import os
 import time
 import atexit
 from pathlib import Path
 from typing import Any, Callable, Dict, List, Optional
 
 from ..core import (
-    PromptVersion, PromptStorage, analyze_prompt_changes, 
-    bump_project_version, is_valid_version, create_versioned_prompt
+    PromptVersion, PromptStorage, analyze_prompt_changes,
+    bump_project_version, is_valid_version
 )
 from ..utils import extract_prompt_from_messages_runtime, interceptor, _trace_context
 
 # Global storage manager to share storage instances by system name
 _storage_instances = {}
 
+# Last recorded (formatted_prompt, agent_version) per (system, function),
+# so repeated calls with an unchanged prompt skip the version-bump path
+# entirely. Keyed by system too: function names alone are not unique across
+# systems, and storages (and agent-version sequences) are per-system.
+_last_seen = {}
+
+# Set CHORUS_RECORD_TIMING=0 to skip execution timing entirely
+_RECORD_TIMING = os.environ.get('CHORUS_RECORD_TIMING', '1') != '0'
+
+# Set CHORUS_EXPOSE_INFO=1 to publish per-call details on func._chorus_info.
+# Off by default: the dict build and setattr on every call only pay off when
+# something actually reads the attribute, and the setattr races under threads.
+_EXPOSE_INFO = os.environ.get('CHORUS_EXPOSE_INFO') == '1'
+
 def _auto_save_all_prompts():
     """Automatically save all prompts when the script exits."""
     for storage in _storage_instances.values():
@@ -64,10 +79,70 @@ def chorus(
         raise ValueError(f"Invalid project version format: {project_version}. Expected semantic version (e.g., '1.0.0')")
     
     def decorator(func: Callable) -> Callable:
+        # The signature never changes for a given function, so compute it
+        # once at decoration time instead of on every call
+        sig = inspect.signature(func)
+
+        # Precompute a cheap argument binder: sig.bind/apply_defaults build
+        # BoundArguments objects on every call and are only needed for
+        # signatures with *args/**kwargs
+        params = sig.parameters
+        has_var_params = any(
+            p.kind in (inspect.Parameter.VAR_POSITIONAL, inspect.Parameter.VAR_KEYWORD)
+            for p in params.values()
+        )
+        param_names = tuple(params)
+        defaults = {
+            name: p.default for name, p in params.items()
+            if p.default is not inspect.Parameter.empty
+        }
+
+        def _bind_arguments(args, kwargs):
+            """Map call arguments to a name -> value dict with defaults applied."""
+            if has_var_params:
+                bound = sig.bind(*args, **kwargs)
+                bound.apply_defaults()
+                return bound.arguments
+            arguments = dict(defaults)
+            arguments.update(zip(param_names, args))
+            arguments.update(kwargs)
+            return arguments
+
+        # Get or create the shared storage instance for this system once;
+        # every call reuses it (and its in-memory indexes) via the closure
+        if system_name not in _storage_instances:
+            _storage_instances[system_name] = PromptStorage(source_filename=system_name)
+        storage = _storage_instances[system_name]
+
+        # Normalize the tags list once; PromptVersion.__init__ would
+        # otherwise evaluate `tags or []` (a fresh list) on every call.
+        # Nothing mutates tags after construction, so sharing it is safe.
+        call_tags = list(tags) if tags else []
+        func_name = func.__name__
+        seen_key = (system_name, func_name)
+
+        # Pick the project-version resolution strategy once: whether a
+        # pinned version was passed never changes, so the wrapper should
+        # not re-test it on every call. Resolution itself stays per-call
+        # (the stored version can change between calls when unpinned).
+        if project_version is not None:
+            def _resolve_project_version():
+                # Pin the project version (a no-op write when unchanged)
+                storage.set_project_version(project_version)
+                return project_version
+        else:
+            def _resolve_project_version():
+                # Use existing project version or default to 1.0.0
+                current = storage.get_project_version()
+                if current is None:
+                    storage.set_project_version("1.0.0")
+                    current = "1.0.0"
+                return current
+
         @functools.wraps(func)
         def wrapper(*args, **kwargs):
-            # Start execution timing
-            start_time = time.time()
+            # Start execution timing (perf_counter: monotonic, high resolution)
+            start_time = time.perf_counter() if _RECORD_TIMING else None
             
             # Set up API interception and context
             interceptor.start_interception()
@@ -82,7 +157,7 @@ def chorus(
                 prompt = extract_prompt_from_messages_runtime(func, *args, **kwargs)
                 
                 if not prompt:
-                    print(f"Warning: No prompt found in function {func.__name__}")
+                    print(f"Warning: No prompt found in function {func_name}")
                     return result
             finally:
                 # Clean up
@@ -90,57 +165,49 @@ def chorus(
                 interceptor.stop_interception()
             
             # Get function arguments for prompt formatting
-            sig = inspect.signature(func)
-            bound_args = sig.bind(*args, **kwargs)
-            bound_args.apply_defaults()
+            arguments = _bind_arguments(args, kwargs)
             
             # Use the intercepted prompt as-is (no formatting needed)
             formatted_prompt = prompt
             
-            # Use the provided system_name
-            # Get or create shared storage instance for this system
-            if system_name not in _storage_instances:
-                _storage_instances[system_name] = PromptStorage(source_filename=system_name)
-            storage = _storage_instances[system_name]
-            
             # Get or set project version
-            if project_version is not None:
-                # Set the project version for this project
-                storage.set_project_version(project_version)
-                current_project_version = project_version
+            current_project_version = _resolve_project_version()
+
+            # Reuse the agent version when this exact prompt was just
+            # recorded; otherwise bump from the O(1) storage index
+            cached = _last_seen.get(seen_key)
+            if cached is not None and cached[0] == formatted_prompt:
+                next_agent_version = cached[1]
             else:
-                # Use existing project version or default to 1.0.0
-                current_project_version = storage.get_project_version()
-                if current_project_version is None:
-                    storage.set_project_version("1.0.0")
-                    current_project_version = "1.0.0"
-            
-            # Create versioned prompt using the new dual versioning system
-            prompt_version = create_versioned_prompt(
-                prompt=formatted_prompt,
-                function_name=func.__name__,
-                project_version=current_project_version,
-                prompts=storage.prompts,
-                description=description,
-                tags=tags
+                next_agent_version = storage.get_latest_agent_version(func_name) + 1
+
+            # Create versioned prompt using the dual versioning system
+            # (positional: prompt, project_version, agent_version,
+            # function_name, description, tags)
+            prompt_version = PromptVersion(
+                formatted_prompt, current_project_version,
+                next_agent_version, func_name, description, call_tags
             )
             
             # Update prompt version with execution data
-            prompt_version.inputs = bound_args.arguments
+            execution_time = time.perf_counter() - start_time if _RECORD_TIMING else None
+            prompt_version.inputs = arguments
             prompt_version.output = result
-            prompt_version.execution_time = time.time() - start_time
+            prompt_version.execution_time = execution_time
             
             # Store the prompt with execution data
             storage.add_prompt(prompt_version)
+            _last_seen[seen_key] = (formatted_prompt, next_agent_version)
             
-            # Add prompt info to function metadata
-            func._chorus_info = {
-                'prompt_version': prompt_version,
-                'original_prompt': prompt,
-                'formatted_prompt': formatted_prompt,
-                'execution_success': True,
-                'execution_time': time.time() - start_time
-            }
+            # Add prompt info to function metadata (opt-in)
+            if _EXPOSE_INFO:
+                func._chorus_info = {
+                    'prompt_version': prompt_version,
+                    'original_prompt': prompt,
+                    'formatted_prompt': formatted_prompt,
+                    'execution_success': True,
+                    'execution_time': execution_time
+                }
             
             # Return the result
             return result
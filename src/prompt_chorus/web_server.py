@@ -2,101 +2,279 @@
 Simple web server for Chorus prompt versioning tool.
 """
 
+import gzip
+import hashlib
 import json
-import webbrowser
+import os
+from collections import defaultdict
 from pathlib import Path
-from http.server import HTTPServer, SimpleHTTPRequestHandler
+from http.server import ThreadingHTTPServer, SimpleHTTPRequestHandler
 from urllib.parse import urlparse
-import threading
-import time
 
-from .core import PromptStorage
+from .core import PromptStorage, parse_version_parts
 from .utils.colors import Colors
 
+# Serialize API responses with orjson (compact, returns bytes) when it is
+# installed; otherwise use compact stdlib json. Pretty-printing on the wire
+# only costs CPU and bytes - browser devtools reformat on demand.
+try:
+    import orjson
+
+    def _dumps_json(data) -> bytes:
+        return orjson.dumps(data)
+
+except ImportError:
+    def _dumps_json(data) -> bytes:
+        return json.dumps(data, separators=(',', ':')).encode('utf-8')
+
+# os.sendfile is Unix-only; fall back to the buffered copy elsewhere
+_HAS_SENDFILE = hasattr(os, 'sendfile')
+
+# Bundled web interface location: fixed for the lifetime of the process,
+# so resolve it once at import time instead of per request
+_WEB_PATH = Path(__file__).parent / "web"
+_WEB_DIR = str(_WEB_PATH)
+
+# Shared storage for the API handlers: one instance per process so its
+# indexes and generation counter persist across requests
+_storage = None
+
+# Serialized API responses keyed by path: (storage generation, body, etag)
+_resp_cache = {}
+
+
+def _get_storage():
+    global _storage
+    if _storage is None:
+        _storage = PromptStorage()
+    return _storage
+
 
 class ChorusHTTPRequestHandler(SimpleHTTPRequestHandler):
     """Simple HTTP handler for the web interface."""
     
     def __init__(self, *args, **kwargs):
-        web_path = Path(__file__).parent / "web"
-        super().__init__(*args, directory=str(web_path), **kwargs)
+        super().__init__(*args, directory=_WEB_DIR, **kwargs)
     
+    # API paths dispatch through a single table lookup instead of an
+    # if/elif chain that grows with every endpoint
+    _API_ROUTES = {
+        '/api/prompts': 'handle_api_prompts',
+        '/api/prompts/stats': 'handle_api_prompts_stats',
+    }
+
     def do_GET(self):
         """Handle GET requests."""
-        parsed_path = urlparse(self.path)
-        
-        if parsed_path.path == '/api/prompts':
-            self.handle_api_prompts()
-        elif parsed_path.path in ['/', '/index.html']:
+        path = urlparse(self.path).path
+
+        handler_name = self._API_ROUTES.get(path)
+        if handler_name is not None:
+            getattr(self, handler_name)()
+            return
+
+        if path in ('/', '/index.html'):
             self.path = '/index.html'
-            super().do_GET()
-        else:
-            super().do_GET()
+        super().do_GET()
     
     def handle_api_prompts(self):
         """Handle /api/prompts endpoint."""
         try:
-            storage = PromptStorage()
-            prompts = storage.list_prompts()
-            
-            # Convert to dictionary format
-            prompts_data = {}
-            for prompt in prompts:
-                key = f"{prompt.function_name}_{prompt.version}"
-                prompts_data[key] = prompt.to_dict()
-            
-            self.send_json_response(prompts_data)
+            self.send_cached_json('/api/prompts', self.build_prompts_payload)
         except Exception as e:
             self.send_error(500, f"Error loading prompts: {str(e)}")
+
+    def build_prompts_payload(self, storage):
+        """Build the /api/prompts response data."""
+        prompts_data = {}
+        for prompt in storage.list_prompts():
+            key = f"{prompt.function_name}_{prompt.version}"
+            prompts_data[key] = prompt.to_dict()
+        return prompts_data
     
+    def handle_api_prompts_stats(self):
+        """Handle /api/prompts/stats endpoint."""
+        try:
+            self.send_cached_json('/api/prompts/stats', self.build_prompts_stats_payload)
+        except Exception as e:
+            self.send_error(500, f"Error loading stats: {str(e)}")
+
+    def build_prompts_stats_payload(self, storage):
+        """Build the /api/prompts/stats response data."""
+        all_prompts = storage.list_prompts()
+
+        # Single traversal: count versions, accumulate tags and track the
+        # latest version per function (numeric semver compare, not
+        # lexicographic) without materializing per-function lists
+        counts = defaultdict(int)
+        tags_by_function = defaultdict(set)
+        latest = {}  # function_name -> (sort key, prompt)
+        for prompt in all_prompts:
+            name = prompt.function_name
+            counts[name] += 1
+            tags_by_function[name].update(prompt.tags)
+            key = parse_version_parts(prompt.project_version) + (prompt.agent_version,)
+            current = latest.get(name)
+            if current is None or key > current[0]:
+                latest[name] = (key, prompt)
+
+        functions = {
+            name: {
+                'versions': counts[name],
+                'latest_version': latest[name][1].version,
+                'tags': sorted(tags_by_function[name])
+            }
+            for name in counts
+        }
+
+        return {
+            'total_prompts': len(all_prompts),
+            'total_functions': len(functions),
+            'functions': functions
+        }
+
+    def send_cached_json(self, cache_key, build_payload):
+        """
+        Serve a JSON response, reusing the serialized body (and honoring
+        If-None-Match with a 304) while the storage is unchanged.
+        """
+        storage = _get_storage()
+        cached = _resp_cache.get(cache_key)
+        if cached is None or cached[0] != storage.generation:
+            body = _dumps_json(build_payload(storage))
+            etag = f'"{hashlib.md5(body).hexdigest()}"'
+            _resp_cache[cache_key] = (storage.generation, body, etag)
+        else:
+            _, body, etag = cached
+
+        if self.headers.get('If-None-Match') == etag:
+            self.send_response(304)
+            self.send_header('ETag', etag)
+            self.send_header('Access-Control-Allow-Origin', '*')
+            self.end_headers()
+            return
+
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Access-Control-Allow-Origin', '*')
+        self.send_header('ETag', etag)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def send_head(self):
+        """Serve the precompressed .gz variant of text assets to gzip clients."""
+        path = self.translate_path(self.path)
+        if path.endswith(('.js', '.css')) and 'gzip' in self.headers.get('Accept-Encoding', ''):
+            gz_path = path + '.gz'
+            if os.path.exists(gz_path):
+                try:
+                    f = open(gz_path, 'rb')
+                except OSError:
+                    return super().send_head()
+                try:
+                    fs = os.fstat(f.fileno())
+                    self.send_response(200)
+                    self.send_header('Content-Type', self.guess_type(path))
+                    self.send_header('Content-Encoding', 'gzip')
+                    self.send_header('Content-Length', str(fs.st_size))
+                    self.send_header('Last-Modified', self.date_time_string(fs.st_mtime))
+                    self.end_headers()
+                    return f
+                except Exception:
+                    f.close()
+                    raise
+        return super().send_head()
+
+    def copyfile(self, source, outputfile):
+        """Copy a file to the socket with zero-copy os.sendfile when possible."""
+        if not _HAS_SENDFILE:
+            return super().copyfile(source, outputfile)
+        try:
+            in_fd = source.fileno()
+            out_fd = outputfile.fileno()
+        except (AttributeError, OSError):
+            return super().copyfile(source, outputfile)
+
+        offset = 0
+        try:
+            remaining = os.fstat(in_fd).st_size
+            while remaining > 0:
+                sent = os.sendfile(out_fd, in_fd, offset, remaining)
+                if sent == 0:
+                    break
+                offset += sent
+                remaining -= sent
+        except OSError:
+            # Only fall back if nothing went out yet; sendfile does not
+            # advance the file object, so retrying after a partial send
+            # would duplicate the already-sent bytes
+            if offset:
+                raise
+            return super().copyfile(source, outputfile)
+
     def send_json_response(self, data):
         """Send JSON response."""
         self.send_response(200)
         self.send_header('Content-Type', 'application/json')
         self.send_header('Access-Control-Allow-Origin', '*')
         self.end_headers()
-        
-        json_data = json.dumps(data, indent=2)
-        self.wfile.write(json_data.encode('utf-8'))
+
+        self.wfile.write(_dumps_json(data))
     
     def log_message(self, format, *args):
         """Suppress log messages."""
         pass
 
 
+def _precompress_static_assets(web_path):
+    """Create .gz variants of the text assets so gzip clients get them directly."""
+    for pattern in ('*.js', '*.css'):
+        for asset in web_path.glob(pattern):
+            gz_file = asset.with_name(asset.name + '.gz')
+            try:
+                if gz_file.exists() and gz_file.stat().st_mtime >= asset.stat().st_mtime:
+                    continue
+                gz_file.write_bytes(gzip.compress(asset.read_bytes()))
+            except OSError:
+                # Read-only install location - uncompressed serving still works
+                return
+
+
 def start_web_server(port=3000, open_browser=True):
     """Start the web server."""
-    web_path = Path(__file__).parent / "web"
-    index_file = web_path / "index.html"
-    
-    if not index_file.exists():
-        print(f"{Colors.RED}Web interface not found at {web_path}{Colors.END}")
+    if not (_WEB_PATH / "index.html").exists():
+        print(f"{Colors.RED}Web interface not found at {_WEB_PATH}{Colors.END}")
         return
+
+    _precompress_static_assets(_WEB_PATH)
     
-    # Find available port
-    for test_port in range(port, port + 10):
+    # Bind directly to the requested port; if it is taken, let the OS pick
+    # a free ephemeral port instead of probing a range one socket at a time
+    try:
+        httpd = ThreadingHTTPServer(('', port), ChorusHTTPRequestHandler)
+    except OSError:
         try:
-            server_address = ('', test_port)
-            httpd = HTTPServer(server_address, ChorusHTTPRequestHandler)
-            break
+            httpd = ThreadingHTTPServer(('', 0), ChorusHTTPRequestHandler)
         except OSError:
-            continue
-    else:
-        print(f"{Colors.RED}Could not find an available port{Colors.END}")
-        return
-    
-    if test_port != port:
-        print(f"{Colors.YELLOW}Port {port} in use, using port {test_port}{Colors.END}")
-    
-    print(f"{Colors.GREEN}{Colors.BOLD}Chorus web server: http://localhost:{test_port}{Colors.END}")
+            print(f"{Colors.RED}Could not find an available port{Colors.END}")
+            return
+
+    actual_port = httpd.server_address[1]
+    if actual_port != port:
+        print(f"{Colors.YELLOW}Port {port} in use, using port {actual_port}{Colors.END}")
+
+    print(f"{Colors.GREEN}{Colors.BOLD}Chorus web server: http://localhost:{actual_port}{Colors.END}")
     print(f"{Colors.CYAN}Press Ctrl+C to stop{Colors.END}")
     
-    # Open browser
+    # Open browser (imports deferred: only this startup path needs them)
     if open_browser:
+        import threading
+        import time
+        import webbrowser
+
         def open_browser_delayed():
             time.sleep(1)
-            webbrowser.open(f'http://localhost:{test_port}')
-        
+            webbrowser.open(f'http://localhost:{actual_port}')
+
         threading.Thread(target=open_browser_delayed, daemon=True).start()
     
     try: